@@ -1,27 +1,44 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
+import base64
+import asyncio
+import functools
+import itertools
 import logging
+import time
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
-import uuid
 import hashlib
-import jwt
+import hmac
+import orjson
 from datetime import datetime, timezone, timedelta
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', 200)),
+    minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', 10)),
+    maxIdleTimeMS=300000,
+    compressors=os.environ.get('MONGO_COMPRESSORS', 'zlib'),
+    serverSelectionTimeoutMS=3000,
+    retryWrites=True,
+    w="majority",
+)
 db = client[os.environ['DB_NAME']]
 JWT_SECRET = os.environ.get('JWT_SECRET', 'temple-secret-key-2025')
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 origins = [
     "https://cheruvugattu.online",
     "https://www.cheruvugattu.online",
@@ -41,55 +58,233 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 # --- Helpers ---
+# scrypt cost parameters (~16 MiB, tens of ms per hash)
+SCRYPT_PREFIX = "$scrypt$"
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2**14, 8, 1
+
+def _scrypt(pw: str, salt: bytes) -> bytes:
+    return hashlib.scrypt(pw.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=32)
+
 def hash_password(pw: str) -> str:
-    return hashlib.sha256(pw.encode()).hexdigest()
+    salt = os.urandom(16)
+    return f"{SCRYPT_PREFIX}{salt.hex()}${_scrypt(pw, salt).hex()}"
 
 def verify_password(pw: str, hashed: str) -> bool:
-    return hash_password(pw) == hashed
+    if hashed.startswith(SCRYPT_PREFIX):
+        try:
+            salt_hex, digest_hex = hashed[len(SCRYPT_PREFIX):].split("$")
+            salt, digest = bytes.fromhex(salt_hex), bytes.fromhex(digest_hex)
+        except ValueError:
+            return False
+        return hmac.compare_digest(_scrypt(pw, salt), digest)
+    # Legacy rows: unsalted SHA-256 hex digest
+    return hmac.compare_digest(hashlib.sha256(pw.encode()).hexdigest().encode(), hashed.encode())
+
+async def check_password(collection, account: dict, pw: str) -> bool:
+    # scrypt is CPU bound, so it runs off the event loop; legacy hashes are upgraded on success
+    hashed = account.get("password_hash", "")
+    if not await asyncio.to_thread(verify_password, pw, hashed):
+        return False
+    if not hashed.startswith(SCRYPT_PREFIX):
+        upgraded = await asyncio.to_thread(hash_password, pw)
+        await collection.update_one({"id": account["id"], "password_hash": hashed}, {"$set": {"password_hash": upgraded}})
+    return True
+
+def new_id() -> str:
+    return os.urandom(16).hex()
+
+def new_ids(n: int) -> list:
+    # One urandom read for a whole batch of ids
+    raw = os.urandom(16 * n).hex()
+    return [raw[i:i + 32] for i in range(0, len(raw), 32)]
+
+def short_tag() -> str:
+    return os.urandom(4).hex().upper()
+
+async def _json_array_chunks(first, cursor):
+    if first is None:
+        yield b"[]"
+        return
+    yield b"[" + orjson.dumps(first)
+    async for doc in cursor:
+        yield b"," + orjson.dumps(doc)
+    yield b"]"
+
+async def stream_json_array(cursor) -> StreamingResponse:
+    # Encode documents as the cursor yields them instead of buffering the whole list.
+    # The first batch is fetched before the 200 goes out so query errors still become a 500.
+    try:
+        first = await cursor.next()
+    except StopAsyncIteration:
+        first = None
+    return StreamingResponse(_json_array_chunks(first, cursor), media_type="application/json")
+
+async def insert_many_unordered(collection, docs: list) -> dict:
+    if not docs:
+        raise HTTPException(status_code=400, detail="No items to insert")
+    failed = []
+    try:
+        await collection.insert_many(docs, ordered=False, bypass_document_validation=False)
+    except BulkWriteError as e:
+        failed = [{"index": err["index"], "error": err["errmsg"]} for err in e.details.get("writeErrors", [])]
+    failed_indexes = {f["index"] for f in failed}
+    for doc in docs:
+        doc.pop("_id", None)
+    return {"inserted": [d for i, d in enumerate(docs) if i not in failed_indexes], "failed": failed}
+
+def ttl_cache(seconds: float, maxsize: int = 32):
+    # Per-process cache of an async endpoint's result, keyed by its arguments.
+    # Decorated functions expose cache_clear() for mutation handlers to call.
+    def decorator(fn):
+        cache: dict = {}
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+            value = await fn(*args, **kwargs)
+            if key not in cache and len(cache) >= maxsize:
+                del cache[next(iter(cache))]
+            cache[key] = (now + seconds, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+# Paid revenue totals live in one stats_counters document, bumped on every paid
+# booking/donation, so admin_stats reads them instead of summing whole collections.
+PAID_REVENUE_PIPELINE = [{"$match": {"payment_status": "Paid"}}, {"$group": {"_id": None, "total": {"$sum": "$amount"}}}]
+
+async def add_revenue(field: str, amount: float):
+    await db.stats_counters.update_one({"key": "main"}, {"$inc": {field: amount}}, upsert=True)
+
+# Audit timestamps only need second resolution, so the formatted clock is reused for up to 1s
+_NOW_CACHE = {"t": 0.0, "iso": "", "ymd": ""}
+
+def now_iso() -> tuple:
+    t = time.time()
+    c = _NOW_CACHE
+    if t - c["t"] > 1.0:
+        d = datetime.fromtimestamp(t, timezone.utc)
+        c.update(t=t, iso=d.isoformat(), ymd=d.strftime("%Y%m%d"))
+    return c["iso"], c["ymd"]
+
+# Tokens are always HS256 JWTs, so they are signed and verified directly with
+# hmac.digest (OpenSSL one-shot HMAC) rather than through a generic JWT library.
+class TokenError(Exception):
+    pass
+
+class TokenExpiredError(TokenError):
+    pass
+
+def _b64url_encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+_JWT_KEY = JWT_SECRET.encode()
+_JWT_HEADER = _b64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+
+def _hs256(msg: bytes) -> bytes:
+    return hmac.digest(_JWT_KEY, msg, "sha256")
 
 def create_token(payload: dict, hours: int = 24) -> str:
-    payload["exp"] = datetime.now(timezone.utc) + timedelta(hours=hours)
-    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+    payload["exp"] = int((datetime.now(timezone.utc) + timedelta(hours=hours)).timestamp())
+    signing_input = f"{_JWT_HEADER}.{_b64url_encode(orjson.dumps(payload))}"
+    return f"{signing_input}.{_b64url_encode(_hs256(signing_input.encode()))}"
 
-def decode_token(token: str) -> dict:
-    return jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+def _verify_token(token: str) -> dict:
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = orjson.loads(_b64url_decode(header_b64))
+        signature = _b64url_decode(signature_b64)
+    except ValueError:
+        raise TokenError("Malformed token")
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise TokenError("Unsupported algorithm")
+    if not hmac.compare_digest(_hs256(f"{header_b64}.{payload_b64}".encode()), signature):
+        raise TokenError("Signature verification failed")
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError:
+        raise TokenError("Malformed token")
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), (int, float)):
+        raise TokenError('Token is missing the "exp" claim')
+    if payload["exp"] <= time.time():
+        raise TokenExpiredError("Signature has expired")
+    return payload
+
+# Verified token payloads keyed by the raw token. The signature covers "exp",
+# so a hit only needs an expiry check; failed decodes are never cached.
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_SWEEP_EVERY = 256
+_token_cache: dict = {}
+_token_cache_inserts = 0
+
+def _sweep_token_cache(now: float):
+    for token in [t for t, p in _token_cache.items() if p["exp"] <= now]:
+        del _token_cache[token]
 
-async def get_current_devotee(credentials: HTTPAuthorizationCredentials = Depends(security)):
+def decode_token(token: str) -> dict:
+    global _token_cache_inserts
+    now = time.time()
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload["exp"] > now:
+            return payload
+        del _token_cache[token]
+        raise TokenExpiredError("Signature has expired")
+    payload = _verify_token(token)
+    _token_cache_inserts += 1
+    if _token_cache_inserts % TOKEN_CACHE_SWEEP_EVERY == 0 or len(_token_cache) >= TOKEN_CACHE_SIZE:
+        _sweep_token_cache(now)
+    if len(_token_cache) >= TOKEN_CACHE_SIZE:
+        del _token_cache[next(iter(_token_cache))]
+    _token_cache[token] = payload
+    return payload
+
+ADMIN_ROLES = frozenset({"EO", "Clerk", "Cashier", "Priest"})
+
+def _resolve_token(credentials: Optional[HTTPAuthorizationCredentials]) -> dict:
     if not credentials:
         raise HTTPException(status_code=401, detail="Not authenticated")
     try:
-        payload = decode_token(credentials.credentials)
-        if payload.get("role") != "devotee":
-            raise HTTPException(status_code=403, detail="Not a devotee")
-        return payload
-    except jwt.ExpiredSignatureError:
+        return decode_token(credentials.credentials)
+    except TokenExpiredError:
         raise HTTPException(status_code=401, detail="Token expired")
-    except Exception:
+    except TokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def get_current_devotee(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    payload = _resolve_token(credentials)
+    if payload.get("role") != "devotee":
+        raise HTTPException(status_code=403, detail="Not a devotee")
+    return payload
+
 async def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    if not credentials:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        payload = decode_token(credentials.credentials)
-        if payload.get("role") not in ["EO", "Clerk", "Cashier", "Priest"]:
-            raise HTTPException(status_code=403, detail="Not an admin")
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    payload = _resolve_token(credentials)
+    if payload.get("role") not in ADMIN_ROLES:
+        raise HTTPException(status_code=403, detail="Not an admin")
+    return payload
 
 async def get_optional_devotee(credentials: HTTPAuthorizationCredentials = Depends(security)):
     if not credentials:
         return None
     try:
-        payload = decode_token(credentials.credentials)
-        return payload
-    except Exception:
+        return decode_token(credentials.credentials)
+    except TokenError:
         return None
 
 # --- Pydantic Models ---
+class APIModel(BaseModel):
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+# Auth models stay on plain BaseModel so passwords are compared exactly as typed
 class DevoteeRegister(BaseModel):
     name: str
     mobile: str
@@ -105,7 +300,7 @@ class AdminLogin(BaseModel):
     username: str
     password: str
 
-class SevaCreate(BaseModel):
+class SevaCreate(APIModel):
     name_english: str
     name_telugu: str
     description: Optional[str] = ""
@@ -118,7 +313,7 @@ class SevaCreate(BaseModel):
     special_instructions: Optional[str] = ""
     active_flag: bool = True
 
-class SevaUpdate(BaseModel):
+class SevaUpdate(APIModel):
     name_english: Optional[str] = None
     name_telugu: Optional[str] = None
     description: Optional[str] = None
@@ -131,17 +326,17 @@ class SevaUpdate(BaseModel):
     special_instructions: Optional[str] = None
     active_flag: Optional[bool] = None
 
-class DayProfileCreate(BaseModel):
+class DayProfileCreate(APIModel):
     name: str
     description: Optional[str] = ""
     is_special_day_flag: bool = False
 
-class DayProfileUpdate(BaseModel):
+class DayProfileUpdate(APIModel):
     name: Optional[str] = None
     description: Optional[str] = None
     is_special_day_flag: Optional[bool] = None
 
-class SlotCreate(BaseModel):
+class SlotCreate(APIModel):
     seva_id: str
     profile_id: str
     date: Optional[str] = None
@@ -151,7 +346,7 @@ class SlotCreate(BaseModel):
     online_quota: int = 10
     counter_quota: int = 10
 
-class SlotUpdate(BaseModel):
+class SlotUpdate(APIModel):
     seva_id: Optional[str] = None
     profile_id: Optional[str] = None
     date: Optional[str] = None
@@ -161,7 +356,7 @@ class SlotUpdate(BaseModel):
     online_quota: Optional[int] = None
     counter_quota: Optional[int] = None
 
-class BookingCreate(BaseModel):
+class BookingCreate(APIModel):
     seva_id: str
     slot_id: str
     for_date: str
@@ -171,10 +366,14 @@ class BookingCreate(BaseModel):
     nakshatra: Optional[str] = ""
     rashi: Optional[str] = ""
 
-class BookingStatusUpdate(BaseModel):
+class BookingStatusUpdate(APIModel):
+    status: str
+
+class BookingStatusBulkItem(APIModel):
+    id: str
     status: str
 
-class DonationCreate(BaseModel):
+class DonationCreate(APIModel):
     donation_type: str  # e-Hundi, AnnaPrasadam
     amount: float
     donor_name: str
@@ -184,7 +383,7 @@ class DonationCreate(BaseModel):
     message: Optional[str] = ""
     is_anonymous: bool = False
 
-class AccommodationCreate(BaseModel):
+class AccommodationCreate(APIModel):
     name: str
     name_telugu: Optional[str] = ""
     description: Optional[str] = ""
@@ -195,7 +394,7 @@ class AccommodationCreate(BaseModel):
     total_rooms: int = 10
     active_flag: bool = True
 
-class AccommodationUpdate(BaseModel):
+class AccommodationUpdate(APIModel):
     name: Optional[str] = None
     name_telugu: Optional[str] = None
     description: Optional[str] = None
@@ -206,7 +405,7 @@ class AccommodationUpdate(BaseModel):
     total_rooms: Optional[int] = None
     active_flag: Optional[bool] = None
 
-class AccommodationBookingCreate(BaseModel):
+class AccommodationBookingCreate(APIModel):
     accommodation_id: str
     check_in_date: str
     check_out_date: str
@@ -214,7 +413,7 @@ class AccommodationBookingCreate(BaseModel):
     num_guests: int = 1
     special_requests: Optional[str] = ""
 
-class NewsCreate(BaseModel):
+class NewsCreate(APIModel):
     title: str
     title_telugu: Optional[str] = ""
     content: str
@@ -222,7 +421,7 @@ class NewsCreate(BaseModel):
     is_important: bool = False
     active_flag: bool = True
 
-class NewsUpdate(BaseModel):
+class NewsUpdate(APIModel):
     title: Optional[str] = None
     title_telugu: Optional[str] = None
     content: Optional[str] = None
@@ -230,22 +429,22 @@ class NewsUpdate(BaseModel):
     is_important: Optional[bool] = None
     active_flag: Optional[bool] = None
 
-class GalleryCreate(BaseModel):
+class GalleryCreate(APIModel):
     title: str
     image_url: str
     category: Optional[str] = "Temple"
     active_flag: bool = True
 
-class GalleryUpdate(BaseModel):
+class GalleryUpdate(APIModel):
     title: Optional[str] = None
     image_url: Optional[str] = None
     category: Optional[str] = None
     active_flag: Optional[bool] = None
 
-class DonationReceiptRequest(BaseModel):
+class DonationReceiptRequest(APIModel):
     donation_id: str
 
-class VolunteerRegister(BaseModel):
+class VolunteerRegister(APIModel):
     name: str
     mobile: str
     email: Optional[str] = ""
@@ -254,10 +453,10 @@ class VolunteerRegister(BaseModel):
     availability: Optional[str] = ""
     message: Optional[str] = ""
 
-class NewsletterSubscribe(BaseModel):
+class NewsletterSubscribe(APIModel):
     email: str
 
-class ContactMessage(BaseModel):
+class ContactMessage(APIModel):
     name: str
     email: str
     mobile: Optional[str] = ""
@@ -265,40 +464,44 @@ class ContactMessage(BaseModel):
     message: str
 
 # ==================== AUTH ROUTES ====================
+# Fields never returned with an account; password_hash is still read for login checks
+PRIVATE_FIELDS = frozenset({"_id", "password_hash"})
+
 @api_router.post("/auth/devotee/register")
 async def devotee_register(data: DevoteeRegister):
     existing = await db.devotees.find_one({"mobile": data.mobile}, {"_id": 0})
     if existing:
         raise HTTPException(status_code=400, detail="Mobile already registered")
+    now, _ = now_iso()
     devotee = {
-        "id": str(uuid.uuid4()), "name": data.name, "mobile": data.mobile,
+        "id": new_id(), "name": data.name, "mobile": data.mobile,
         "email": data.email, "gotram": data.gotram,
-        "password_hash": hash_password(data.password),
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "last_login_at": datetime.now(timezone.utc).isoformat()
+        "password_hash": await asyncio.to_thread(hash_password, data.password),
+        "created_at": now,
+        "last_login_at": now
     }
     await db.devotees.insert_one(devotee)
     token = create_token({"sub": devotee["id"], "name": devotee["name"], "mobile": devotee["mobile"], "role": "devotee"})
-    return {"token": token, "devotee": {k: v for k, v in devotee.items() if k not in ["_id", "password_hash"]}}
+    return {"token": token, "devotee": {k: v for k, v in devotee.items() if k not in PRIVATE_FIELDS}}
 
 @api_router.post("/auth/devotee/login")
 async def devotee_login(data: DevoteeLogin):
     devotee = await db.devotees.find_one({"mobile": data.mobile}, {"_id": 0})
-    if not devotee or not verify_password(data.password, devotee.get("password_hash", "")):
+    if not devotee or not await check_password(db.devotees, devotee, data.password):
         raise HTTPException(status_code=401, detail="Invalid mobile or password")
-    await db.devotees.update_one({"id": devotee["id"]}, {"$set": {"last_login_at": datetime.now(timezone.utc).isoformat()}})
+    await db.devotees.update_one({"id": devotee["id"]}, {"$set": {"last_login_at": now_iso()[0]}})
     token = create_token({"sub": devotee["id"], "name": devotee["name"], "mobile": devotee["mobile"], "role": "devotee"})
-    return {"token": token, "devotee": {k: v for k, v in devotee.items() if k not in ["_id", "password_hash"]}}
+    return {"token": token, "devotee": {k: v for k, v in devotee.items() if k not in PRIVATE_FIELDS}}
 
 @api_router.post("/auth/admin/login")
 async def admin_login(data: AdminLogin):
     user = await db.user_accounts.find_one({"username": data.username}, {"_id": 0})
-    if not user or not verify_password(data.password, user.get("password_hash", "")):
+    if not user or not await check_password(db.user_accounts, user, data.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.get("active_flag", False):
         raise HTTPException(status_code=403, detail="Account disabled")
     token = create_token({"sub": user["id"], "name": user["name"], "role": user["role"], "username": user["username"]})
-    return {"token": token, "user": {k: v for k, v in user.items() if k not in ["_id", "password_hash"]}}
+    return {"token": token, "user": {k: v for k, v in user.items() if k not in PRIVATE_FIELDS}}
 
 @api_router.get("/devotee/profile")
 async def get_devotee_profile(user=Depends(get_current_devotee)):
@@ -327,19 +530,25 @@ async def get_seva(seva_id: str):
 
 @api_router.post("/admin/sevas")
 async def create_seva(data: SevaCreate, user=Depends(get_current_admin)):
-    seva = {"id": str(uuid.uuid4()), **data.model_dump(), "created_at": datetime.now(timezone.utc).isoformat()}
+    seva = {"id": new_id(), **data.model_dump(), "created_at": now_iso()[0]}
     await db.sevas.insert_one(seva)
-    return {k: v for k, v in seva.items() if k != "_id"}
+    seva.pop("_id", None)
+    return seva
+
+@api_router.post("/admin/sevas/bulk")
+async def create_sevas_bulk(data: List[SevaCreate], user=Depends(get_current_admin)):
+    now, _ = now_iso()
+    return await insert_many_unordered(db.sevas, [{"id": new_id(), **d.model_dump(), "created_at": now} for d in data])
 
 @api_router.put("/admin/sevas/{seva_id}")
 async def update_seva(seva_id: str, data: SevaUpdate, user=Depends(get_current_admin)):
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    update_data = data.model_dump(exclude_none=True, exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    result = await db.sevas.update_one({"id": seva_id}, {"$set": update_data})
-    if result.matched_count == 0:
+    doc = await db.sevas.find_one_and_update({"id": seva_id}, {"$set": update_data}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
         raise HTTPException(status_code=404, detail="Seva not found")
-    return await db.sevas.find_one({"id": seva_id}, {"_id": 0})
+    return doc
 
 @api_router.delete("/admin/sevas/{seva_id}")
 async def delete_seva(seva_id: str, user=Depends(get_current_admin)):
@@ -355,17 +564,20 @@ async def list_day_profiles():
 
 @api_router.post("/admin/day-profiles")
 async def create_day_profile(data: DayProfileCreate, user=Depends(get_current_admin)):
-    profile = {"id": str(uuid.uuid4()), **data.model_dump()}
+    profile = {"id": new_id(), **data.model_dump()}
     await db.day_profiles.insert_one(profile)
-    return {k: v for k, v in profile.items() if k != "_id"}
+    profile.pop("_id", None)
+    return profile
 
 @api_router.put("/admin/day-profiles/{profile_id}")
 async def update_day_profile(profile_id: str, data: DayProfileUpdate, user=Depends(get_current_admin)):
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    update_data = data.model_dump(exclude_none=True, exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    await db.day_profiles.update_one({"id": profile_id}, {"$set": update_data})
-    return await db.day_profiles.find_one({"id": profile_id}, {"_id": 0})
+    doc = await db.day_profiles.find_one_and_update({"id": profile_id}, {"$set": update_data}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return doc
 
 @api_router.delete("/admin/day-profiles/{profile_id}")
 async def delete_day_profile(profile_id: str, user=Depends(get_current_admin)):
@@ -384,32 +596,44 @@ async def list_schedule_slots(seva_id: Optional[str] = None, profile_id: Optiona
 
 @api_router.get("/slots/available")
 async def get_available_slots(seva_id: str, date: str):
-    slots = await db.schedule_slots.find({"seva_id": seva_id}, {"_id": 0}).to_list(100)
-    available = []
-    for slot in slots:
-        if slot.get("date") and slot["date"] != date:
-            continue
-        booked = await db.bookings.count_documents({"slot_id": slot["id"], "for_date": date, "status": {"$nin": ["Cancelled"]}})
-        remaining = slot.get("online_quota", 10) - booked
-        if remaining > 0:
-            slot["remaining_slots"] = remaining
-            slot["booked_count"] = booked
-            available.append(slot)
-    return available
+    pipeline = [
+        {"$match": {"seva_id": seva_id, "$or": [{"date": None}, {"date": ""}, {"date": date}]}},
+        # Same counters reserve_slot checks, so availability and reservation agree
+        {"$lookup": {
+            "from": "slot_counters", "let": {"sid": "$id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [{"$eq": ["$slot_id", "$$sid"]}, {"$eq": ["$for_date", date]}]}}},
+                {"$project": {"_id": 0, "n": 1}},
+            ],
+            "as": "c",
+        }},
+        {"$addFields": {"booked_count": {"$ifNull": [{"$arrayElemAt": ["$c.n", 0]}, 0]}}},
+        {"$addFields": {"remaining_slots": {"$subtract": [{"$ifNull": ["$online_quota", 10]}, "$booked_count"]}}},
+        {"$match": {"remaining_slots": {"$gt": 0}}},
+        {"$project": {"_id": 0, "c": 0}},
+    ]
+    return await db.schedule_slots.aggregate(pipeline).to_list(100)
 
 @api_router.post("/admin/schedule-slots")
 async def create_schedule_slot(data: SlotCreate, user=Depends(get_current_admin)):
-    slot = {"id": str(uuid.uuid4()), **data.model_dump()}
+    slot = {"id": new_id(), **data.model_dump()}
     await db.schedule_slots.insert_one(slot)
-    return {k: v for k, v in slot.items() if k != "_id"}
+    slot.pop("_id", None)
+    return slot
+
+@api_router.post("/admin/schedule-slots/bulk")
+async def create_schedule_slots_bulk(data: List[SlotCreate], user=Depends(get_current_admin)):
+    return await insert_many_unordered(db.schedule_slots, [{"id": new_id(), **d.model_dump()} for d in data])
 
 @api_router.put("/admin/schedule-slots/{slot_id}")
 async def update_schedule_slot(slot_id: str, data: SlotUpdate, user=Depends(get_current_admin)):
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    update_data = data.model_dump(exclude_none=True, exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    await db.schedule_slots.update_one({"id": slot_id}, {"$set": update_data})
-    return await db.schedule_slots.find_one({"id": slot_id}, {"_id": 0})
+    doc = await db.schedule_slots.find_one_and_update({"id": slot_id}, {"$set": update_data}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Slot not found")
+    return doc
 
 @api_router.delete("/admin/schedule-slots/{slot_id}")
 async def delete_schedule_slot(slot_id: str, user=Depends(get_current_admin)):
@@ -419,30 +643,81 @@ async def delete_schedule_slot(slot_id: str, user=Depends(get_current_admin)):
     return {"message": "Slot deleted"}
 
 # ==================== BOOKING ROUTES ====================
+# Online bookings per slot and date are counted in slot_counters ({slot_id, for_date, n},
+# unique on slot_id+for_date), so a seat is reserved with a single conditional upsert.
+async def reserve_slot(slot: dict, for_date: str) -> bool:
+    quota = slot.get("online_quota", 10)
+    if quota <= 0:
+        return False
+    query = {"slot_id": slot["id"], "for_date": for_date, "n": {"$lt": quota}}
+    try:
+        await db.slot_counters.update_one(query, {"$inc": {"n": 1}}, upsert=True)
+    except DuplicateKeyError:
+        # The counter exists: either it is full (the n filter failed) or a concurrent
+        # first booking created it, so retry as a plain conditional $inc
+        result = await db.slot_counters.update_one(query, {"$inc": {"n": 1}})
+        return result.modified_count == 1
+    return True
+
+def slot_count_update(slot_id: str, for_date: str, delta: int) -> UpdateOne:
+    # A missing counter means no active bookings, so only increments may create one
+    return UpdateOne({"slot_id": slot_id, "for_date": for_date}, {"$inc": {"n": delta}}, upsert=delta > 0)
+
+async def adjust_slot_count(slot_id: str, for_date: str, delta: int):
+    await db.slot_counters.update_one({"slot_id": slot_id, "for_date": for_date}, {"$inc": {"n": delta}}, upsert=delta > 0)
+
+# Booking list views only render these fields; the matching indexes cover the queries
+# (no hint(): the planner picks them, and a missing index degrades to a slower scan)
+TICKET_LIST_FIELDS = ["id", "booking_number", "seva_name_english", "seva_name_telugu", "for_date", "slot_start_time", "slot_end_time", "devotee_name", "status", "amount"]
+MY_BOOKINGS_FIELDS = ["id", "seva_name_english", "seva_name_telugu", "for_date", "slot_start_time", "slot_end_time", "gotram", "number_of_persons", "status", "amount"]
+TICKET_LOOKUP_INDEX = [("devotee_mobile", 1), ("booking_date_time", -1)] + [(f, 1) for f in TICKET_LIST_FIELDS]
+MY_BOOKINGS_INDEX = [("devotee_id", 1), ("booking_date_time", -1)] + [(f, 1) for f in MY_BOOKINGS_FIELDS]
+TICKET_LIST_PROJECTION = {"_id": 0, "booking_date_time": 1, **{f: 1 for f in TICKET_LIST_FIELDS}}
+MY_BOOKINGS_PROJECTION = {"_id": 0, "booking_date_time": 1, **{f: 1 for f in MY_BOOKINGS_FIELDS}}
+
+BOOKING_NUMBER_ATTEMPTS = 3
+BULK_STATUS_LIMIT = 1000
+BOOKING_STATUSES = ["Pending", "Confirmed", "Completed", "Cancelled", "NoShow"]
+
+def _slot_count_delta(old_status: Optional[str], new_status: str) -> int:
+    if old_status != "Cancelled" and new_status == "Cancelled":
+        return -1
+    if old_status == "Cancelled" and new_status != "Cancelled":
+        return 1
+    return 0
+
 @api_router.post("/bookings")
 async def create_booking(data: BookingCreate, user=Depends(get_current_devotee)):
-    seva = await db.sevas.find_one({"id": data.seva_id}, {"_id": 0})
+    seva, slot, devotee = await asyncio.gather(
+        db.sevas.find_one({"id": data.seva_id}, {"_id": 0}),
+        db.schedule_slots.find_one({"id": data.slot_id}, {"_id": 0}),
+        db.devotees.find_one({"id": user["sub"]}, {"_id": 0, "password_hash": 0})
+    )
     if not seva:
         raise HTTPException(status_code=404, detail="Seva not found")
-    slot = await db.schedule_slots.find_one({"id": data.slot_id}, {"_id": 0})
     if not slot:
         raise HTTPException(status_code=404, detail="Slot not found")
+    if not devotee:
+        raise HTTPException(status_code=404, detail="Devotee not found")
     if data.number_of_persons < 1 or data.number_of_persons > seva.get("max_persons_per_ticket", 4):
         raise HTTPException(status_code=400, detail=f"Number of persons must be 1-{seva.get('max_persons_per_ticket', 4)}")
-    booked = await db.bookings.count_documents({"slot_id": data.slot_id, "for_date": data.for_date, "status": {"$nin": ["Cancelled"]}})
-    if booked >= slot.get("online_quota", 10):
+    try:
+        datetime.strptime(data.for_date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="for_date must be YYYY-MM-DD")
+    if not await reserve_slot(slot, data.for_date):
         raise HTTPException(status_code=400, detail="No slots available")
-    devotee = await db.devotees.find_one({"id": user["sub"]}, {"_id": 0, "password_hash": 0})
+    now, ymd = now_iso()
     booking = {
-        "id": str(uuid.uuid4()),
-        "booking_number": f"SPJR-{datetime.now(timezone.utc).strftime('%Y%m%d')}-{str(uuid.uuid4())[:6].upper()}",
+        "id": new_id(),
+        "booking_number": f"SPJR-{ymd}-{short_tag()}",
         "devotee_id": user["sub"], "devotee_name": devotee.get("name", ""),
         "devotee_mobile": devotee.get("mobile", ""),
         "seva_id": data.seva_id, "seva_name_english": seva.get("name_english", ""),
         "seva_name_telugu": seva.get("name_telugu", ""),
         "slot_id": data.slot_id, "slot_start_time": slot.get("start_time", ""),
         "slot_end_time": slot.get("end_time", ""),
-        "booking_date_time": datetime.now(timezone.utc).isoformat(),
+        "booking_date_time": now,
         "for_date": data.for_date, "status": "Confirmed", "payment_status": "Paid",
         "number_of_persons": data.number_of_persons, "gotram": data.gotram,
         "is_paroksha": data.is_paroksha,
@@ -450,12 +725,28 @@ async def create_booking(data: BookingCreate, user=Depends(get_current_devotee))
         "amount": seva.get("base_price", 0),
         "note_to_devotee": seva.get("special_instructions", "")
     }
-    await db.bookings.insert_one(booking)
-    return {k: v for k, v in booking.items() if k != "_id"}
+    try:
+        for attempt in range(BOOKING_NUMBER_ATTEMPTS):
+            try:
+                await db.bookings.insert_one(booking)
+                break
+            except DuplicateKeyError:
+                # booking_number is unique; a tag collision just needs a fresh tag
+                if attempt == BOOKING_NUMBER_ATTEMPTS - 1:
+                    raise
+                booking.pop("_id", None)
+                booking["booking_number"] = f"SPJR-{ymd}-{short_tag()}"
+    except Exception:
+        # Release the seat reserved above so the counter matches real bookings
+        await adjust_slot_count(slot["id"], data.for_date, -1)
+        raise
+    await add_revenue("bookings_revenue", booking["amount"])
+    booking.pop("_id", None)
+    return booking
 
 @api_router.get("/bookings/my")
 async def get_my_bookings(user=Depends(get_current_devotee)):
-    return await db.bookings.find({"devotee_id": user["sub"]}, {"_id": 0}).sort("booking_date_time", -1).to_list(100)
+    return await db.bookings.find({"devotee_id": user["sub"]}, MY_BOOKINGS_PROJECTION).sort("booking_date_time", -1).to_list(100)
 
 @api_router.get("/bookings/{booking_id}")
 async def get_booking(booking_id: str):
@@ -471,7 +762,7 @@ async def lookup_ticket(booking_number: Optional[str] = None, mobile: Optional[s
         if booking:
             return [booking]
     if mobile:
-        bookings = await db.bookings.find({"devotee_mobile": mobile}, {"_id": 0}).sort("booking_date_time", -1).to_list(20)
+        bookings = await db.bookings.find({"devotee_mobile": mobile}, TICKET_LIST_PROJECTION).sort("booking_date_time", -1).to_list(20)
         return bookings
     raise HTTPException(status_code=400, detail="Provide booking_number or mobile")
 
@@ -481,22 +772,59 @@ async def admin_list_bookings(date: Optional[str] = None, seva_id: Optional[str]
     if date: query["for_date"] = date
     if seva_id: query["seva_id"] = seva_id
     if status: query["status"] = status
-    return await db.bookings.find(query, {"_id": 0}).sort("booking_date_time", -1).to_list(500)
+    return await stream_json_array(db.bookings.find(query, {"_id": 0}).sort("booking_date_time", -1).limit(500))
 
 @api_router.put("/admin/bookings/{booking_id}/status")
 async def update_booking_status(booking_id: str, data: BookingStatusUpdate, user=Depends(get_current_admin)):
-    valid_statuses = ["Pending", "Confirmed", "Completed", "Cancelled", "NoShow"]
-    if data.status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
-    await db.bookings.update_one({"id": booking_id}, {"$set": {"status": data.status}})
-    return await db.bookings.find_one({"id": booking_id}, {"_id": 0})
+    if data.status not in BOOKING_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {BOOKING_STATUSES}")
+    before = await db.bookings.find_one_and_update({"id": booking_id}, {"$set": {"status": data.status}}, projection={"_id": 0})
+    if not before:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    delta = _slot_count_delta(before.get("status"), data.status)
+    if delta:
+        await adjust_slot_count(before["slot_id"], before["for_date"], delta)
+    return {**before, "status": data.status}
+
+@api_router.put("/admin/bookings/status/bulk")
+async def update_booking_status_bulk(data: List[BookingStatusBulkItem], user=Depends(get_current_admin)):
+    if not data:
+        raise HTTPException(status_code=400, detail="No bookings to update")
+    if any(item.status not in BOOKING_STATUSES for item in data):
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {BOOKING_STATUSES}")
+    if len(data) > BULK_STATUS_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_STATUS_LIMIT} bookings per request")
+    new_status = {item.id: item.status for item in data}
+    current = await db.bookings.find({"id": {"$in": list(new_status)}}, {"_id": 0, "id": 1, "status": 1, "slot_id": 1, "for_date": 1}).to_list(len(new_status))
+    # One update_many per (slot, date, old status, new status); filtering on the status that
+    # was read means each group's modified_count is exactly how many seats changed hands,
+    # even if a single-item update races with this one (its row is then left to it)
+    groups = {}
+    for b in current:
+        old, new = b.get("status"), new_status[b["id"]]
+        if old != new:
+            groups.setdefault((b.get("slot_id"), b.get("for_date"), old, new), []).append(b["id"])
+    results = await asyncio.gather(*(
+        db.bookings.update_many({"id": {"$in": ids}, "status": old}, {"$set": {"status": new}})
+        for (_, _, old, new), ids in groups.items()
+    ))
+    deltas = {}
+    for (slot_id, for_date, old, new), result in zip(groups, results):
+        delta = _slot_count_delta(old, new) * result.modified_count
+        if delta and slot_id:
+            deltas[(slot_id, for_date)] = deltas.get((slot_id, for_date), 0) + delta
+    slot_updates = [slot_count_update(slot_id, for_date, delta) for (slot_id, for_date), delta in deltas.items() if delta]
+    if slot_updates:
+        await db.slot_counters.bulk_write(slot_updates, ordered=False)
+    return {"matched": len(current), "modified": sum(r.modified_count for r in results)}
 
 # ==================== DONATION ROUTES (e-Hundi + AnnaPrasadam) ====================
 @api_router.post("/donations")
 async def create_donation(data: DonationCreate, user=Depends(get_optional_devotee)):
+    now, ymd = now_iso()
     donation = {
-        "id": str(uuid.uuid4()),
-        "donation_number": f"DON-{datetime.now(timezone.utc).strftime('%Y%m%d')}-{str(uuid.uuid4())[:6].upper()}",
+        "id": new_id(),
+        "donation_number": f"DON-{ymd}-{short_tag()[:6]}",
         "donation_type": data.donation_type,
         "amount": data.amount,
         "donor_name": data.donor_name if not data.is_anonymous else "Anonymous",
@@ -507,10 +835,12 @@ async def create_donation(data: DonationCreate, user=Depends(get_optional_devote
         "is_anonymous": data.is_anonymous,
         "devotee_id": user["sub"] if user else None,
         "payment_status": "Paid",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now
     }
     await db.donations.insert_one(donation)
-    return {k: v for k, v in donation.items() if k != "_id"}
+    await add_revenue("donations_revenue", donation["amount"])
+    donation.pop("_id", None)
+    return donation
 
 @api_router.get("/donations/my")
 async def get_my_donations(user=Depends(get_current_devotee)):
@@ -520,17 +850,20 @@ async def get_my_donations(user=Depends(get_current_devotee)):
 async def admin_list_donations(donation_type: Optional[str] = None, user=Depends(get_current_admin)):
     query = {}
     if donation_type: query["donation_type"] = donation_type
-    return await db.donations.find(query, {"_id": 0}).sort("created_at", -1).to_list(500)
+    return await stream_json_array(db.donations.find(query, {"_id": 0}).sort("created_at", -1).limit(500))
 
 @api_router.get("/admin/donation-stats")
 async def admin_donation_stats(user=Depends(get_current_admin)):
-    pipeline_hundi = [{"$match": {"donation_type": "e-Hundi", "payment_status": "Paid"}}, {"$group": {"_id": None, "total": {"$sum": "$amount"}, "count": {"$sum": 1}}}]
-    pipeline_anna = [{"$match": {"donation_type": "AnnaPrasadam", "payment_status": "Paid"}}, {"$group": {"_id": None, "total": {"$sum": "$amount"}, "count": {"$sum": 1}}}]
-    hundi = await db.donations.aggregate(pipeline_hundi).to_list(1)
-    anna = await db.donations.aggregate(pipeline_anna).to_list(1)
+    pipeline = [
+        {"$match": {"donation_type": {"$in": ["e-Hundi", "AnnaPrasadam"]}, "payment_status": "Paid"}},
+        {"$group": {"_id": "$donation_type", "total": {"$sum": "$amount"}, "count": {"$sum": 1}}},
+    ]
+    totals = {row["_id"]: row for row in await db.donations.aggregate(pipeline).to_list(2)}
+    hundi = totals.get("e-Hundi", {})
+    anna = totals.get("AnnaPrasadam", {})
     return {
-        "e_hundi": {"total": hundi[0]["total"] if hundi else 0, "count": hundi[0]["count"] if hundi else 0},
-        "anna_prasadam": {"total": anna[0]["total"] if anna else 0, "count": anna[0]["count"] if anna else 0}
+        "e_hundi": {"total": hundi.get("total", 0), "count": hundi.get("count", 0)},
+        "anna_prasadam": {"total": anna.get("total", 0), "count": anna.get("count", 0)}
     }
 
 @api_router.get("/donations/{donation_id}/receipt")
@@ -563,18 +896,23 @@ async def get_donation_receipt(donation_id: str):
     }
     return receipt
 
+_ONES = ("","One","Two","Three","Four","Five","Six","Seven","Eight","Nine","Ten","Eleven","Twelve","Thirteen","Fourteen","Fifteen","Sixteen","Seventeen","Eighteen","Nineteen")
+_TENS = ("","","Twenty","Thirty","Forty","Fifty","Sixty","Seventy","Eighty","Ninety")
+
+@functools.lru_cache(maxsize=2048)
+def _number_to_words(num: int) -> str:
+    if num < 20: return _ONES[num]
+    if num < 100: return _TENS[num//10] + (" " + _ONES[num%10] if num%10 else "")
+    if num < 1000: return _ONES[num//100] + " Hundred" + (" and " + _number_to_words(num%100) if num%100 else "")
+    if num < 100000: return _number_to_words(num//1000) + " Thousand" + (" " + _number_to_words(num%1000) if num%1000 else "")
+    if num < 10000000: return _number_to_words(num//100000) + " Lakh" + (" " + _number_to_words(num%100000) if num%100000 else "")
+    return _number_to_words(num//10000000) + " Crore" + (" " + _number_to_words(num%10000000) if num%10000000 else "")
+
+# Donation amounts cluster on a few round values, so receipts mostly hit the cache
+@functools.lru_cache(maxsize=2048)
 def _amount_to_words(n: int) -> str:
     if n == 0: return "Zero"
-    ones = ["","One","Two","Three","Four","Five","Six","Seven","Eight","Nine","Ten","Eleven","Twelve","Thirteen","Fourteen","Fifteen","Sixteen","Seventeen","Eighteen","Nineteen"]
-    tens = ["","","Twenty","Thirty","Forty","Fifty","Sixty","Seventy","Eighty","Ninety"]
-    def _convert(num):
-        if num < 20: return ones[num]
-        if num < 100: return tens[num//10] + (" " + ones[num%10] if num%10 else "")
-        if num < 1000: return ones[num//100] + " Hundred" + (" and " + _convert(num%100) if num%100 else "")
-        if num < 100000: return _convert(num//1000) + " Thousand" + (" " + _convert(num%1000) if num%1000 else "")
-        if num < 10000000: return _convert(num//100000) + " Lakh" + (" " + _convert(num%100000) if num%100000 else "")
-        return _convert(num//10000000) + " Crore" + (" " + _convert(num%10000000) if num%10000000 else "")
-    return _convert(n) + " Rupees Only"
+    return _number_to_words(n) + " Rupees Only"
 
 # ==================== ACCOMMODATION ROUTES ====================
 @api_router.get("/accommodations")
@@ -591,17 +929,20 @@ async def get_accommodation(acc_id: str):
 
 @api_router.post("/admin/accommodations")
 async def create_accommodation(data: AccommodationCreate, user=Depends(get_current_admin)):
-    acc = {"id": str(uuid.uuid4()), **data.model_dump(), "created_at": datetime.now(timezone.utc).isoformat()}
+    acc = {"id": new_id(), **data.model_dump(), "created_at": now_iso()[0]}
     await db.accommodations.insert_one(acc)
-    return {k: v for k, v in acc.items() if k != "_id"}
+    acc.pop("_id", None)
+    return acc
 
 @api_router.put("/admin/accommodations/{acc_id}")
 async def update_accommodation(acc_id: str, data: AccommodationUpdate, user=Depends(get_current_admin)):
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    update_data = data.model_dump(exclude_none=True, exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    await db.accommodations.update_one({"id": acc_id}, {"$set": update_data})
-    return await db.accommodations.find_one({"id": acc_id}, {"_id": 0})
+    doc = await db.accommodations.find_one_and_update({"id": acc_id}, {"$set": update_data}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Accommodation not found")
+    return doc
 
 @api_router.delete("/admin/accommodations/{acc_id}")
 async def delete_accommodation(acc_id: str, user=Depends(get_current_admin)):
@@ -613,10 +954,14 @@ async def delete_accommodation(acc_id: str, user=Depends(get_current_admin)):
 # ==================== ACCOMMODATION BOOKING ROUTES ====================
 @api_router.post("/accommodation-bookings")
 async def create_accommodation_booking(data: AccommodationBookingCreate, user=Depends(get_current_devotee)):
-    acc = await db.accommodations.find_one({"id": data.accommodation_id}, {"_id": 0})
+    acc, devotee = await asyncio.gather(
+        db.accommodations.find_one({"id": data.accommodation_id}, {"_id": 0}),
+        db.devotees.find_one({"id": user["sub"]}, {"_id": 0, "password_hash": 0})
+    )
     if not acc:
         raise HTTPException(status_code=404, detail="Accommodation not found")
-    devotee = await db.devotees.find_one({"id": user["sub"]}, {"_id": 0, "password_hash": 0})
+    if not devotee:
+        raise HTTPException(status_code=404, detail="Devotee not found")
     from datetime import date as dt_date
     check_in = datetime.strptime(data.check_in_date, "%Y-%m-%d").date()
     check_out = datetime.strptime(data.check_out_date, "%Y-%m-%d").date()
@@ -624,9 +969,10 @@ async def create_accommodation_booking(data: AccommodationBookingCreate, user=De
     if num_days < 1:
         raise HTTPException(status_code=400, detail="Check-out must be after check-in")
     total_amount = acc["price_per_day"] * data.num_rooms * num_days
+    now, ymd = now_iso()
     booking = {
-        "id": str(uuid.uuid4()),
-        "booking_number": f"ACC-{datetime.now(timezone.utc).strftime('%Y%m%d')}-{str(uuid.uuid4())[:6].upper()}",
+        "id": new_id(),
+        "booking_number": f"ACC-{ymd}-{short_tag()[:6]}",
         "devotee_id": user["sub"], "devotee_name": devotee.get("name", ""),
         "devotee_mobile": devotee.get("mobile", ""),
         "accommodation_id": data.accommodation_id,
@@ -636,10 +982,11 @@ async def create_accommodation_booking(data: AccommodationBookingCreate, user=De
         "num_days": num_days, "num_rooms": data.num_rooms, "num_guests": data.num_guests,
         "special_requests": data.special_requests,
         "amount": total_amount, "payment_status": "Paid", "status": "Confirmed",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": now
     }
     await db.accommodation_bookings.insert_one(booking)
-    return {k: v for k, v in booking.items() if k != "_id"}
+    booking.pop("_id", None)
+    return booking
 
 @api_router.get("/accommodation-bookings/my")
 async def get_my_accommodation_bookings(user=Depends(get_current_devotee)):
@@ -647,12 +994,14 @@ async def get_my_accommodation_bookings(user=Depends(get_current_devotee)):
 
 @api_router.get("/admin/accommodation-bookings")
 async def admin_list_accommodation_bookings(user=Depends(get_current_admin)):
-    return await db.accommodation_bookings.find({}, {"_id": 0}).sort("created_at", -1).to_list(500)
+    return await stream_json_array(db.accommodation_bookings.find({}, {"_id": 0}).sort("created_at", -1).limit(500))
 
 @api_router.put("/admin/accommodation-bookings/{booking_id}/status")
 async def update_acc_booking_status(booking_id: str, data: BookingStatusUpdate, user=Depends(get_current_admin)):
-    await db.accommodation_bookings.update_one({"id": booking_id}, {"$set": {"status": data.status}})
-    return await db.accommodation_bookings.find_one({"id": booking_id}, {"_id": 0})
+    doc = await db.accommodation_bookings.find_one_and_update({"id": booking_id}, {"$set": {"status": data.status}}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return doc
 
 # ==================== NEWS ROUTES ====================
 @api_router.get("/news")
@@ -669,17 +1018,20 @@ async def get_news(news_id: str):
 
 @api_router.post("/admin/news")
 async def create_news(data: NewsCreate, user=Depends(get_current_admin)):
-    item = {"id": str(uuid.uuid4()), **data.model_dump(), "created_at": datetime.now(timezone.utc).isoformat()}
+    item = {"id": new_id(), **data.model_dump(), "created_at": now_iso()[0]}
     await db.news.insert_one(item)
-    return {k: v for k, v in item.items() if k != "_id"}
+    item.pop("_id", None)
+    return item
 
 @api_router.put("/admin/news/{news_id}")
 async def update_news(news_id: str, data: NewsUpdate, user=Depends(get_current_admin)):
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    update_data = data.model_dump(exclude_none=True, exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    await db.news.update_one({"id": news_id}, {"$set": update_data})
-    return await db.news.find_one({"id": news_id}, {"_id": 0})
+    doc = await db.news.find_one_and_update({"id": news_id}, {"$set": update_data}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
+        raise HTTPException(status_code=404, detail="News not found")
+    return doc
 
 @api_router.delete("/admin/news/{news_id}")
 async def delete_news(news_id: str, user=Depends(get_current_admin)):
@@ -690,6 +1042,7 @@ async def delete_news(news_id: str, user=Depends(get_current_admin)):
 
 # ==================== GALLERY ROUTES ====================
 @api_router.get("/gallery")
+@ttl_cache(30)
 async def list_gallery(active_only: bool = True, media_type: Optional[str] = None):
     query = {}
     if active_only:
@@ -700,46 +1053,58 @@ async def list_gallery(active_only: bool = True, media_type: Optional[str] = Non
 
 @api_router.post("/admin/gallery")
 async def create_gallery(data: GalleryCreate, user=Depends(get_current_admin)):
-    item = {"id": str(uuid.uuid4()), **data.model_dump(), "created_at": datetime.now(timezone.utc).isoformat()}
+    item = {"id": new_id(), **data.model_dump(), "created_at": now_iso()[0]}
     await db.gallery.insert_one(item)
-    return {k: v for k, v in item.items() if k != "_id"}
+    list_gallery.cache_clear()
+    item.pop("_id", None)
+    return item
 
 @api_router.put("/admin/gallery/{item_id}")
 async def update_gallery(item_id: str, data: GalleryUpdate, user=Depends(get_current_admin)):
-    update_data = {k: v for k, v in data.model_dump().items() if v is not None}
+    update_data = data.model_dump(exclude_none=True, exclude_unset=True)
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
-    await db.gallery.update_one({"id": item_id}, {"$set": update_data})
-    return await db.gallery.find_one({"id": item_id}, {"_id": 0})
+    doc = await db.gallery.find_one_and_update({"id": item_id}, {"$set": update_data}, projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    list_gallery.cache_clear()
+    return doc
 
 @api_router.delete("/admin/gallery/{item_id}")
 async def delete_gallery(item_id: str, user=Depends(get_current_admin)):
     result = await db.gallery.delete_one({"id": item_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Gallery item not found")
+    list_gallery.cache_clear()
     return {"message": "Gallery item deleted"}
 
 # ==================== ADMIN DEVOTEES + STATS ====================
+# Columns rendered by the admin devotees table; the index holds all of them so the listing is a covered query
+DEVOTEE_LIST_FIELDS = ["id", "name", "mobile", "email", "gotram"]
+DEVOTEE_LIST_PROJECTION = {"_id": 0, "created_at": 1, **{f: 1 for f in DEVOTEE_LIST_FIELDS}}
+DEVOTEE_LIST_INDEX = [("created_at", -1)] + [(f, 1) for f in DEVOTEE_LIST_FIELDS]
+
 @api_router.get("/admin/devotees")
 async def admin_list_devotees(user=Depends(get_current_admin)):
-    return await db.devotees.find({}, {"_id": 0, "password_hash": 0}).to_list(500)
+    return await db.devotees.find({}, DEVOTEE_LIST_PROJECTION).sort("created_at", -1).to_list(500)
 
 @api_router.get("/admin/stats")
 async def admin_stats(user=Depends(get_current_admin)):
-    total_devotees = await db.devotees.count_documents({})
-    total_bookings = await db.bookings.count_documents({})
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    today_bookings = await db.bookings.count_documents({"for_date": today})
-    total_sevas = await db.sevas.count_documents({"active_flag": True})
-    confirmed_bookings = await db.bookings.count_documents({"status": "Confirmed"})
-    pipeline = [{"$match": {"payment_status": "Paid"}}, {"$group": {"_id": None, "total": {"$sum": "$amount"}}}]
-    rev = await db.bookings.aggregate(pipeline).to_list(1)
-    total_revenue = rev[0]["total"] if rev else 0
-    total_donations = await db.donations.count_documents({})
-    don_pipeline = [{"$match": {"payment_status": "Paid"}}, {"$group": {"_id": None, "total": {"$sum": "$amount"}}}]
-    don_rev = await db.donations.aggregate(don_pipeline).to_list(1)
-    total_donation_amount = don_rev[0]["total"] if don_rev else 0
-    total_acc_bookings = await db.accommodation_bookings.count_documents({})
+    (total_devotees, total_bookings, total_donations, total_acc_bookings,
+     total_sevas, today_bookings, confirmed_bookings, counters) = await asyncio.gather(
+        db.devotees.estimated_document_count(),
+        db.bookings.estimated_document_count(),
+        db.donations.estimated_document_count(),
+        db.accommodation_bookings.estimated_document_count(),
+        db.sevas.count_documents({"active_flag": True}),
+        db.bookings.count_documents({"for_date": today}),
+        db.bookings.count_documents({"status": "Confirmed"}),
+        db.stats_counters.find_one({"key": "main"}, {"_id": 0})
+    )
+    counters = counters or {}
+    total_revenue = counters.get("bookings_revenue", 0)
+    total_donation_amount = counters.get("donations_revenue", 0)
     return {
         "total_devotees": total_devotees, "total_bookings": total_bookings,
         "today_bookings": today_bookings, "total_sevas": total_sevas,
@@ -752,12 +1117,13 @@ async def admin_stats(user=Depends(get_current_admin)):
 # ==================== VOLUNTEER ROUTES ====================
 @api_router.post("/volunteers")
 async def register_volunteer(data: VolunteerRegister):
-    existing = await db.volunteers.find_one({"mobile": data.mobile}, {"_id": 0})
-    if existing:
+    vol = {"id": new_id(), **data.model_dump(), "status": "Pending", "created_at": now_iso()[0]}
+    try:
+        await db.volunteers.insert_one(vol)
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Mobile already registered as volunteer")
-    vol = {"id": str(uuid.uuid4()), **data.model_dump(), "status": "Pending", "created_at": datetime.now(timezone.utc).isoformat()}
-    await db.volunteers.insert_one(vol)
-    return {k: v for k, v in vol.items() if k != "_id"}
+    vol.pop("_id", None)
+    return vol
 
 @api_router.get("/admin/volunteers")
 async def admin_list_volunteers(user=Depends(get_current_admin)):
@@ -766,18 +1132,20 @@ async def admin_list_volunteers(user=Depends(get_current_admin)):
 # ==================== NEWSLETTER ROUTES ====================
 @api_router.post("/newsletter/subscribe")
 async def newsletter_subscribe(data: NewsletterSubscribe):
-    existing = await db.newsletter.find_one({"email": data.email})
-    if existing:
+    # The unique email index turns a repeat subscription into a DuplicateKeyError
+    try:
+        await db.newsletter.insert_one({"id": new_id(), "email": data.email, "subscribed_at": now_iso()[0]})
+    except DuplicateKeyError:
         return {"message": "Already subscribed"}
-    await db.newsletter.insert_one({"id": str(uuid.uuid4()), "email": data.email, "subscribed_at": datetime.now(timezone.utc).isoformat()})
     return {"message": "Subscribed successfully"}
 
 # ==================== CONTACT ROUTES ====================
 @api_router.post("/contact")
 async def submit_contact(data: ContactMessage):
-    msg = {"id": str(uuid.uuid4()), **data.model_dump(), "status": "New", "created_at": datetime.now(timezone.utc).isoformat()}
+    msg = {"id": new_id(), **data.model_dump(), "status": "New", "created_at": now_iso()[0]}
     await db.contact_messages.insert_one(msg)
-    return {k: v for k, v in msg.items() if k != "_id"}
+    msg.pop("_id", None)
+    return msg
 
 @api_router.get("/admin/contact-messages")
 async def admin_contact_messages(user=Depends(get_current_admin)):
@@ -785,107 +1153,140 @@ async def admin_contact_messages(user=Depends(get_current_admin)):
 
 # ==================== VISITOR STATS ROUTES ====================
 @api_router.get("/visitor-stats")
+@ttl_cache(5)
 async def get_visitor_stats():
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     stats = await db.visitor_stats.find_one({"key": "main"}, {"_id": 0})
     if not stats:
-        stats = {"total_visitors": 12847, "todays_visitors": 0, "last_reset_date": datetime.now(timezone.utc).strftime("%Y-%m-%d")}
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        stats = {"total_visitors": 12847, "todays_visitors": 0, "last_reset_date": today}
     if stats.get("last_reset_date") != today:
-        await db.visitor_stats.update_one({"key": "main"}, {"$set": {"todays_visitors": 0, "last_reset_date": today}}, upsert=True)
+        # Only reset if no tracker has rolled the day over in the meantime
+        await db.visitor_stats.update_one({"key": "main", "last_reset_date": {"$ne": today}}, {"$set": {"todays_visitors": 0, "last_reset_date": today}})
         stats["todays_visitors"] = 0
     return stats
 
 @api_router.post("/visitor-stats/track")
 async def track_visitor():
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    result = await db.visitor_stats.find_one({"key": "main"})
-    if not result:
-        await db.visitor_stats.insert_one({"key": "main", "total_visitors": 12848, "todays_visitors": 1, "last_reset_date": today})
-    else:
-        update = {"$inc": {"total_visitors": 1, "todays_visitors": 1}}
-        if result.get("last_reset_date") != today:
-            update = {"$inc": {"total_visitors": 1}, "$set": {"todays_visitors": 1, "last_reset_date": today}}
-        await db.visitor_stats.update_one({"key": "main"}, update)
+    # Single pipeline update: the daily reset and both increments happen atomically
+    await db.visitor_stats.update_one({"key": "main"}, [{"$set": {
+        "total_visitors": {"$add": [{"$ifNull": ["$total_visitors", 12847]}, 1]},
+        "todays_visitors": {"$cond": [{"$eq": ["$last_reset_date", today]}, {"$add": [{"$ifNull": ["$todays_visitors", 0]}, 1]}, 1]},
+        "last_reset_date": today
+    }}], upsert=True)
     return {"message": "tracked"}
 
 # ==================== LIVE STREAM ROUTES ====================
 @api_router.get("/live-streams")
+@ttl_cache(30)
 async def get_live_streams():
     return await db.live_streams.find({}, {"_id": 0}).to_list(10)
 
 
 # ==================== SEED DATA ====================
+# Seed documents without per-insert fields; id and created_at are filled in by seed_data
+SEED_SEVAS = [
+    {"name_english": "Abhishekam", "name_telugu": "అభిషేకం", "description": "Sacred bathing ritual of the deity with milk, water, honey and other holy substances", "base_price": 500, "duration_minutes": 45, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 10, "max_persons_per_ticket": 4, "special_instructions": "Please arrive 30 minutes before the scheduled time. Wear traditional attire.", "active_flag": True},
+    {"name_english": "Archana", "name_telugu": "అర్చన", "description": "Offering of flowers and chanting of sacred names of the deity", "base_price": 100, "duration_minutes": 20, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 25, "max_persons_per_ticket": 4, "special_instructions": "Bring flowers if possible. Temple also provides.", "active_flag": True},
+    {"name_english": "Kumkuma Archana", "name_telugu": "కుంకుమ అర్చన", "description": "Special archana performed with sacred kumkum powder", "base_price": 200, "duration_minutes": 30, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 15, "max_persons_per_ticket": 4, "special_instructions": "Available on all days. Special significance on Fridays.", "active_flag": True},
+    {"name_english": "Sahasranama Archana", "name_telugu": "సహస్రనామ అర్చన", "description": "Chanting of 1000 names of Lord Shiva during the puja", "base_price": 300, "duration_minutes": 60, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 8, "max_persons_per_ticket": 4, "special_instructions": "Full duration puja. Please be present throughout.", "active_flag": True},
+    {"name_english": "Kalyanam", "name_telugu": "కల్యాణం", "description": "Celestial marriage ceremony of Lord Shiva and Goddess Parvathi", "base_price": 1000, "duration_minutes": 90, "is_online_bookable": True, "is_paroksha_available": False, "max_per_slot_default": 5, "max_persons_per_ticket": 4, "special_instructions": "Special occasion puja. Bring traditional items as instructed.", "active_flag": True},
+    {"name_english": "Rudra Abhishekam", "name_telugu": "రుద్ర అభిషేకం", "description": "Grand abhishekam with Rudra Namakam Chamakam chanting", "base_price": 750, "duration_minutes": 75, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 6, "max_persons_per_ticket": 4, "special_instructions": "Most auspicious on Mondays and Pradosham days.", "active_flag": True},
+]
+
+SEED_DAY_PROFILES = [
+    {"name": "Normal Day", "description": "Regular weekday schedule", "is_special_day_flag": False},
+    {"name": "Weekend", "description": "Saturday and Sunday schedule with extended hours", "is_special_day_flag": False},
+    {"name": "Pournami", "description": "Full moon day - special puja timings", "is_special_day_flag": True},
+    {"name": "Amavasya", "description": "New moon day", "is_special_day_flag": True},
+    {"name": "Maha Shivaratri", "description": "Annual grand festival of Lord Shiva", "is_special_day_flag": True},
+]
+
+SEED_SLOT_TIMES = (("06:00","07:00"),("08:00","09:00"),("10:00","11:00"),("16:00","17:00"),("18:00","19:00"))
+
+SEED_ACCOMMODATIONS = [
+    {"name": "Siva Nilayam - AC Room", "name_telugu": "శివ నిలయం - ఏసీ రూమ్", "description": "Comfortable AC rooms with attached bathroom, hot water, and basic amenities", "room_type": "AC", "capacity": 3, "price_per_day": 800, "amenities": "AC, Attached Bathroom, Hot Water, TV, Bed Linen", "total_rooms": 10, "active_flag": True},
+    {"name": "Parvathi Sadanam - Non-AC Room", "name_telugu": "పార్వతి సదనం - నాన్ ఏసీ రూమ్", "description": "Clean non-AC rooms with fan and attached bathroom", "room_type": "Non-AC", "capacity": 3, "price_per_day": 400, "amenities": "Fan, Attached Bathroom, Hot Water, Bed Linen", "total_rooms": 15, "active_flag": True},
+    {"name": "Nandi Cottage", "name_telugu": "నంది కాటేజ్", "description": "Spacious cottage suitable for families with separate living area", "room_type": "Cottage", "capacity": 6, "price_per_day": 1500, "amenities": "AC, Kitchen, Living Room, 2 Bedrooms, Hot Water, TV", "total_rooms": 5, "active_flag": True},
+    {"name": "Pilgrim Dormitory", "name_telugu": "యాత్రికుల డార్మిటరీ", "description": "Affordable dormitory beds for individual pilgrims", "room_type": "Dormitory", "capacity": 1, "price_per_day": 100, "amenities": "Fan, Common Bathroom, Locker", "total_rooms": 50, "active_flag": True},
+]
+
+SEED_NEWS = [
+    {"title": "Maha Shivaratri Brahmotsavams 2026", "title_telugu": "మహా శివరాత్రి బ్రహ్మోత్సవాలు 2026", "content": "Maha Shivaratri Brahmotsavams will be celebrated from February 20 to March 2, 2026. Special sevas and darshan timings will be announced soon. Devotees are requested to book accommodations in advance.", "content_telugu": "మహా శివరాత్రి బ్రహ్మోత్సవాలు ఫిబ్రవరి 20 నుండి మార్చి 2, 2026 వరకు జరుపబడతాయి. ప్రత్యేక సేవలు మరియు దర్శన సమయాలు త్వరలో ప్రకటించబడతాయి.", "is_important": True, "active_flag": True},
+    {"title": "Online Seva Booking Now Available", "title_telugu": "ఆన్‌లైన్ సేవ బుకింగ్ ఇప్పుడు అందుబాటులో ఉంది", "content": "Devotees can now book sevas online through our website. All major sevas including Abhishekam, Archana, and Rudra Abhishekam are available for online booking.", "content_telugu": "భక్తులు ఇప్పుడు మా వెబ్‌సైట్ ద్వారా ఆన్‌లైన్‌లో సేవలను బుక్ చేసుకోవచ్చు.", "is_important": False, "active_flag": True},
+    {"title": "Paroksha Seva for Devotees Worldwide", "title_telugu": "ప్రపంచవ్యాప్తంగా భక్తులకు పరోక్ష సేవ", "content": "Devotees who cannot visit the temple can now book Paroksha Seva. The priest will perform the seva on your behalf and prasadam will be sent to your address.", "content_telugu": "దేవాలయాన్ని సందర్శించలేని భక్తులు ఇప్పుడు పరోక్ష సేవను బుక్ చేసుకోవచ్చు.", "is_important": False, "active_flag": True},
+]
+
+SEED_GALLERY = [
+    {"title": "Temple Gopuram", "image_url": "https://images.unsplash.com/photo-1582560475093-6f09a3dc9739?auto=format&fit=crop&w=800&q=80", "category": "Temple", "active_flag": True},
+    {"title": "Sacred Shrine", "image_url": "https://images.unsplash.com/photo-1606293926075-69a00dbfde81?auto=format&fit=crop&w=800&q=80", "category": "Temple", "active_flag": True},
+    {"title": "Festival Celebrations", "image_url": "https://images.unsplash.com/photo-1716047270022-b01edb8022af?auto=format&fit=crop&w=800&q=80", "category": "Festival", "active_flag": True},
+    {"title": "Devotee Gathering", "image_url": "https://images.unsplash.com/photo-1641666017082-02c741e2af4b?auto=format&fit=crop&w=800&q=80", "category": "Devotees", "active_flag": True},
+    {"title": "Temple at Dusk", "image_url": "https://images.unsplash.com/photo-1690312021800-9b5991464fd2?auto=format&fit=crop&w=800&q=80", "category": "Temple", "active_flag": True},
+    {"title": "Sacred Rituals", "image_url": "https://images.unsplash.com/photo-1567591370504-82a4d58d4349?auto=format&fit=crop&w=800&q=80", "category": "Seva", "active_flag": True},
+]
+
+SEED_LIVE_STREAMS = [
+    {"name": "Temple Live Darshan", "description": "24x7 live darshan from the main sanctum", "stream_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "platform": "YouTube", "is_live": True, "schedule_info": "24x7 Live"},
+    {"name": "Temple TV Channel", "description": "Devotional programs, bhajans, and temple events", "stream_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "platform": "YouTube", "is_live": True, "schedule_info": "6 AM - 10 PM Daily"},
+]
+
+SEED_VIDEO_GALLERY = [
+    {"title": "Maha Shivaratri Celebrations 2025", "image_url": "https://img.youtube.com/vi/dQw4w9WgXcQ/hqdefault.jpg", "media_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "category": "Festival", "media_type": "VIDEO", "active_flag": True},
+    {"title": "Temple Documentary - Sacred Cheruvugattu", "image_url": "https://img.youtube.com/vi/dQw4w9WgXcQ/hqdefault.jpg", "media_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "category": "Documentary", "media_type": "VIDEO", "active_flag": True},
+    {"title": "Daily Abhishekam Ritual", "image_url": "https://img.youtube.com/vi/dQw4w9WgXcQ/hqdefault.jpg", "media_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "category": "Seva", "media_type": "VIDEO", "active_flag": True},
+]
+
 @api_router.post("/seed")
 async def seed_data():
-    admin_exists = await db.user_accounts.find_one({"username": "admin"})
-    if admin_exists:
+    if app.state.seeded:
         return {"message": "Data already seeded"}
-    admin = {"id": str(uuid.uuid4()), "name": "Temple EO", "mobile": "9000000001", "role": "EO", "username": "admin", "password_hash": hash_password("admin123"), "active_flag": True}
-    await db.user_accounts.insert_one(admin)
-    sevas = [
-        {"id": str(uuid.uuid4()), "name_english": "Abhishekam", "name_telugu": "అభిషేకం", "description": "Sacred bathing ritual of the deity with milk, water, honey and other holy substances", "base_price": 500, "duration_minutes": 45, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 10, "max_persons_per_ticket": 4, "special_instructions": "Please arrive 30 minutes before the scheduled time. Wear traditional attire.", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name_english": "Archana", "name_telugu": "అర్చన", "description": "Offering of flowers and chanting of sacred names of the deity", "base_price": 100, "duration_minutes": 20, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 25, "max_persons_per_ticket": 4, "special_instructions": "Bring flowers if possible. Temple also provides.", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name_english": "Kumkuma Archana", "name_telugu": "కుంకుమ అర్చన", "description": "Special archana performed with sacred kumkum powder", "base_price": 200, "duration_minutes": 30, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 15, "max_persons_per_ticket": 4, "special_instructions": "Available on all days. Special significance on Fridays.", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name_english": "Sahasranama Archana", "name_telugu": "సహస్రనామ అర్చన", "description": "Chanting of 1000 names of Lord Shiva during the puja", "base_price": 300, "duration_minutes": 60, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 8, "max_persons_per_ticket": 4, "special_instructions": "Full duration puja. Please be present throughout.", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name_english": "Kalyanam", "name_telugu": "కల్యాణం", "description": "Celestial marriage ceremony of Lord Shiva and Goddess Parvathi", "base_price": 1000, "duration_minutes": 90, "is_online_bookable": True, "is_paroksha_available": False, "max_per_slot_default": 5, "max_persons_per_ticket": 4, "special_instructions": "Special occasion puja. Bring traditional items as instructed.", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name_english": "Rudra Abhishekam", "name_telugu": "రుద్ర అభిషేకం", "description": "Grand abhishekam with Rudra Namakam Chamakam chanting", "base_price": 750, "duration_minutes": 75, "is_online_bookable": True, "is_paroksha_available": True, "max_per_slot_default": 6, "max_persons_per_ticket": 4, "special_instructions": "Most auspicious on Mondays and Pradosham days.", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    await db.sevas.insert_many(sevas)
-    profiles = [
-        {"id": str(uuid.uuid4()), "name": "Normal Day", "description": "Regular weekday schedule", "is_special_day_flag": False},
-        {"id": str(uuid.uuid4()), "name": "Weekend", "description": "Saturday and Sunday schedule with extended hours", "is_special_day_flag": False},
-        {"id": str(uuid.uuid4()), "name": "Pournami", "description": "Full moon day - special puja timings", "is_special_day_flag": True},
-        {"id": str(uuid.uuid4()), "name": "Amavasya", "description": "New moon day", "is_special_day_flag": True},
-        {"id": str(uuid.uuid4()), "name": "Maha Shivaratri", "description": "Annual grand festival of Lord Shiva", "is_special_day_flag": True},
-    ]
-    await db.day_profiles.insert_many(profiles)
+    # Another worker may have seeded since startup
+    if await db.user_accounts.find_one({"username": "admin"}, {"_id": 1}):
+        app.state.seeded = True
+        return {"message": "Data already seeded"}
+    seed_count = (1 + len(SEED_SEVAS) * (1 + 2 * len(SEED_SLOT_TIMES)) + len(SEED_DAY_PROFILES) + len(SEED_ACCOMMODATIONS)
+                  + len(SEED_NEWS) + len(SEED_GALLERY) + len(SEED_LIVE_STREAMS) + len(SEED_VIDEO_GALLERY))
+    ids = iter(new_ids(seed_count))
+    ts = datetime.now(timezone.utc)
+    now, today = ts.isoformat(), ts.strftime("%Y-%m-%d")
+    admin = {"id": next(ids), "name": "Temple EO", "mobile": "9000000001", "role": "EO", "username": "admin", "password_hash": await asyncio.to_thread(hash_password, "admin123"), "active_flag": True}
+    sevas = [{"id": next(ids), **t, "created_at": now} for t in SEED_SEVAS]
+    profiles = [{"id": next(ids), **t} for t in SEED_DAY_PROFILES]
     normal_id, weekend_id = profiles[0]["id"], profiles[1]["id"]
-    slots = []
-    for seva in sevas:
-        for pid in [normal_id, weekend_id]:
-            for st, et in [("06:00","07:00"),("08:00","09:00"),("10:00","11:00"),("16:00","17:00"),("18:00","19:00")]:
-                slots.append({"id": str(uuid.uuid4()), "seva_id": seva["id"], "profile_id": pid, "date": None, "start_time": st, "end_time": et, "max_bookings": seva["max_per_slot_default"], "online_quota": seva["max_per_slot_default"]//2+2, "counter_quota": seva["max_per_slot_default"]//2})
-    await db.schedule_slots.insert_many(slots)
-    # Seed accommodations
-    accommodations = [
-        {"id": str(uuid.uuid4()), "name": "Siva Nilayam - AC Room", "name_telugu": "శివ నిలయం - ఏసీ రూమ్", "description": "Comfortable AC rooms with attached bathroom, hot water, and basic amenities", "room_type": "AC", "capacity": 3, "price_per_day": 800, "amenities": "AC, Attached Bathroom, Hot Water, TV, Bed Linen", "total_rooms": 10, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Parvathi Sadanam - Non-AC Room", "name_telugu": "పార్వతి సదనం - నాన్ ఏసీ రూమ్", "description": "Clean non-AC rooms with fan and attached bathroom", "room_type": "Non-AC", "capacity": 3, "price_per_day": 400, "amenities": "Fan, Attached Bathroom, Hot Water, Bed Linen", "total_rooms": 15, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Nandi Cottage", "name_telugu": "నంది కాటేజ్", "description": "Spacious cottage suitable for families with separate living area", "room_type": "Cottage", "capacity": 6, "price_per_day": 1500, "amenities": "AC, Kitchen, Living Room, 2 Bedrooms, Hot Water, TV", "total_rooms": 5, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "name": "Pilgrim Dormitory", "name_telugu": "యాత్రికుల డార్మిటరీ", "description": "Affordable dormitory beds for individual pilgrims", "room_type": "Dormitory", "capacity": 1, "price_per_day": 100, "amenities": "Fan, Common Bathroom, Locker", "total_rooms": 50, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
+    seva_quotas = [(seva["id"], seva["max_per_slot_default"], seva["max_per_slot_default"]//2) for seva in sevas]
+    slots = [
+        {"id": next(ids), "seva_id": seva_id, "profile_id": pid, "date": None, "start_time": st, "end_time": et, "max_bookings": max_bookings, "online_quota": half+2, "counter_quota": half}
+        for (seva_id, max_bookings, half), pid, (st, et) in itertools.product(seva_quotas, (normal_id, weekend_id), SEED_SLOT_TIMES)
     ]
-    await db.accommodations.insert_many(accommodations)
+    # Seed accommodations
+    accommodations = [{"id": next(ids), **t, "created_at": now} for t in SEED_ACCOMMODATIONS]
     # Seed news
-    news_items = [
-        {"id": str(uuid.uuid4()), "title": "Maha Shivaratri Brahmotsavams 2026", "title_telugu": "మహా శివరాత్రి బ్రహ్మోత్సవాలు 2026", "content": "Maha Shivaratri Brahmotsavams will be celebrated from February 20 to March 2, 2026. Special sevas and darshan timings will be announced soon. Devotees are requested to book accommodations in advance.", "content_telugu": "మహా శివరాత్రి బ్రహ్మోత్సవాలు ఫిబ్రవరి 20 నుండి మార్చి 2, 2026 వరకు జరుపబడతాయి. ప్రత్యేక సేవలు మరియు దర్శన సమయాలు త్వరలో ప్రకటించబడతాయి.", "is_important": True, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Online Seva Booking Now Available", "title_telugu": "ఆన్‌లైన్ సేవ బుకింగ్ ఇప్పుడు అందుబాటులో ఉంది", "content": "Devotees can now book sevas online through our website. All major sevas including Abhishekam, Archana, and Rudra Abhishekam are available for online booking.", "content_telugu": "భక్తులు ఇప్పుడు మా వెబ్‌సైట్ ద్వారా ఆన్‌లైన్‌లో సేవలను బుక్ చేసుకోవచ్చు.", "is_important": False, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Paroksha Seva for Devotees Worldwide", "title_telugu": "ప్రపంచవ్యాప్తంగా భక్తులకు పరోక్ష సేవ", "content": "Devotees who cannot visit the temple can now book Paroksha Seva. The priest will perform the seva on your behalf and prasadam will be sent to your address.", "content_telugu": "దేవాలయాన్ని సందర్శించలేని భక్తులు ఇప్పుడు పరోక్ష సేవను బుక్ చేసుకోవచ్చు.", "is_important": False, "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    await db.news.insert_many(news_items)
+    news_items = [{"id": next(ids), **t, "created_at": now} for t in SEED_NEWS]
     # Seed gallery
-    gallery_items = [
-        {"id": str(uuid.uuid4()), "title": "Temple Gopuram", "image_url": "https://images.unsplash.com/photo-1582560475093-6f09a3dc9739?auto=format&fit=crop&w=800&q=80", "category": "Temple", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Sacred Shrine", "image_url": "https://images.unsplash.com/photo-1606293926075-69a00dbfde81?auto=format&fit=crop&w=800&q=80", "category": "Temple", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Festival Celebrations", "image_url": "https://images.unsplash.com/photo-1716047270022-b01edb8022af?auto=format&fit=crop&w=800&q=80", "category": "Festival", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Devotee Gathering", "image_url": "https://images.unsplash.com/photo-1641666017082-02c741e2af4b?auto=format&fit=crop&w=800&q=80", "category": "Devotees", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Temple at Dusk", "image_url": "https://images.unsplash.com/photo-1690312021800-9b5991464fd2?auto=format&fit=crop&w=800&q=80", "category": "Temple", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Sacred Rituals", "image_url": "https://images.unsplash.com/photo-1567591370504-82a4d58d4349?auto=format&fit=crop&w=800&q=80", "category": "Seva", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    await db.gallery.insert_many(gallery_items)
+    gallery_items = [{"id": next(ids), **t, "created_at": now} for t in SEED_GALLERY]
     # Seed live streams
-    live_streams = [
-        {"id": str(uuid.uuid4()), "name": "Temple Live Darshan", "description": "24x7 live darshan from the main sanctum", "stream_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "platform": "YouTube", "is_live": True, "schedule_info": "24x7 Live"},
-        {"id": str(uuid.uuid4()), "name": "Temple TV Channel", "description": "Devotional programs, bhajans, and temple events", "stream_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "platform": "YouTube", "is_live": True, "schedule_info": "6 AM - 10 PM Daily"},
-    ]
-    await db.live_streams.insert_many(live_streams)
+    live_streams = [{"id": next(ids), **t} for t in SEED_LIVE_STREAMS]
     # Seed visitor stats
-    await db.visitor_stats.insert_one({"key": "main", "total_visitors": 12847, "todays_visitors": 42, "last_reset_date": datetime.now(timezone.utc).strftime("%Y-%m-%d")})
+    # Footer tracking may already have upserted the "main" row, so only fill it if absent
+    visitor_stats = {"total_visitors": 12847, "todays_visitors": 42, "last_reset_date": today}
     # Seed video gallery items
-    video_gallery = [
-        {"id": str(uuid.uuid4()), "title": "Maha Shivaratri Celebrations 2025", "image_url": "https://img.youtube.com/vi/dQw4w9WgXcQ/hqdefault.jpg", "media_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "category": "Festival", "media_type": "VIDEO", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Temple Documentary - Sacred Cheruvugattu", "image_url": "https://img.youtube.com/vi/dQw4w9WgXcQ/hqdefault.jpg", "media_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "category": "Documentary", "media_type": "VIDEO", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": str(uuid.uuid4()), "title": "Daily Abhishekam Ritual", "image_url": "https://img.youtube.com/vi/dQw4w9WgXcQ/hqdefault.jpg", "media_url": "https://www.youtube.com/embed/dQw4w9WgXcQ", "category": "Seva", "media_type": "VIDEO", "active_flag": True, "created_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    await db.gallery.insert_many(video_gallery)
+    video_gallery = [{"id": next(ids), **t, "created_at": now} for t in SEED_VIDEO_GALLERY]
+    # Ids are generated client-side, so no insert depends on another having landed
+    await asyncio.gather(
+        db.user_accounts.insert_one(admin),
+        db.sevas.insert_many(sevas, ordered=False),
+        db.day_profiles.insert_many(profiles, ordered=False),
+        db.schedule_slots.insert_many(slots, ordered=False),
+        db.accommodations.insert_many(accommodations, ordered=False),
+        db.news.insert_many(news_items, ordered=False),
+        db.gallery.insert_many(gallery_items + video_gallery, ordered=False),
+        db.live_streams.insert_many(live_streams, ordered=False),
+        db.visitor_stats.update_one({"key": "main"}, {"$setOnInsert": visitor_stats}, upsert=True)
+    )
+    app.state.seeded = True
+    list_gallery.cache_clear()
+    get_live_streams.cache_clear()
     return {"message": "Seed data created successfully", "sevas": len(sevas), "profiles": len(profiles), "slots": len(slots), "accommodations": len(accommodations), "news": len(news_items), "gallery": len(gallery_items) + len(video_gallery)}
 
 @api_router.get("/")
@@ -895,6 +1296,93 @@ async def root():
 app.include_router(api_router)
 app.add_middleware(CORSMiddleware, allow_credentials=True, allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','), allow_methods=["*"], allow_headers=["*"])
 
+INDEXES = [
+    (db.bookings, [("slot_id", 1), ("for_date", 1), ("status", 1)], {}),
+    (db.bookings, MY_BOOKINGS_INDEX, {}),
+    (db.bookings, [("booking_number", 1)], {"unique": True}),
+    (db.bookings, TICKET_LOOKUP_INDEX, {}),
+    (db.sevas, [("active_flag", 1), ("is_paroksha_available", 1)], {}),
+    (db.schedule_slots, [("seva_id", 1), ("profile_id", 1)], {}),
+    (db.donations, [("donation_type", 1), ("payment_status", 1), ("created_at", -1)], {}),
+    (db.devotees, [("mobile", 1)], {"unique": True}),
+    (db.user_accounts, [("username", 1)], {"unique": True}),
+    (db.bookings, [("for_date", 1)], {}),
+    (db.bookings, [("status", 1)], {}),
+    (db.gallery, [("active_flag", 1), ("media_type", 1), ("created_at", -1)], {}),
+    (db.news, [("active_flag", 1), ("created_at", -1)], {}),
+    (db.volunteers, [("mobile", 1)], {"unique": True}),
+    (db.newsletter, [("email", 1)], {"unique": True}),
+    (db.visitor_stats, [("key", 1)], {"unique": True}),
+    (db.devotees, DEVOTEE_LIST_INDEX, {}),
+    (db.volunteers, [("created_at", -1)], {}),
+    (db.contact_messages, [("created_at", -1)], {}),
+    (db.stats_counters, [("key", 1)], {"unique": True}),
+    (db.slot_counters, [("slot_id", 1), ("for_date", 1)], {"unique": True}),
+]
+
+@app.on_event("startup")
+async def warm_db_pool():
+    # Open the first pooled connection before traffic instead of on the first request
+    await client.admin.command("ping")
+
+async def create_indexes(specs: list) -> list:
+    results = await asyncio.gather(
+        *(coll.create_index(keys, **opts) for coll, keys, opts in specs),
+        return_exceptions=True,
+    )
+    failed = []
+    for (coll, keys, _), result in zip(specs, results):
+        if isinstance(result, Exception):
+            logger.warning("Could not create index %s on %s: %s", keys, coll.name, result)
+            failed.append(f"{coll.name}{keys}")
+    return failed
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # createIndexes blocks until the build finishes, so only the unique indexes that
+    # signup, seeding and booking numbers rely on are awaited; the rest build behind traffic
+    unique = [spec for spec in INDEXES if spec[2].get("unique")]
+    app.state.index_build = asyncio.create_task(create_indexes([spec for spec in INDEXES if not spec[2].get("unique")]))
+    missing_unique = await create_indexes(unique)
+    if missing_unique:
+        raise RuntimeError(f"Required unique indexes could not be built: {', '.join(missing_unique)}")
+
+@app.on_event("startup")
+async def init_stats_counters():
+    # Backfill the revenue counters once from existing data
+    if await db.stats_counters.find_one({"key": "main"}, {"_id": 1}):
+        return
+    booking_rev, donation_rev = await asyncio.gather(
+        db.bookings.aggregate(PAID_REVENUE_PIPELINE).to_list(1),
+        db.donations.aggregate(PAID_REVENUE_PIPELINE).to_list(1)
+    )
+    await db.stats_counters.update_one({"key": "main"}, {"$setOnInsert": {
+        "bookings_revenue": booking_rev[0]["total"] if booking_rev else 0,
+        "donations_revenue": donation_rev[0]["total"] if donation_rev else 0
+    }}, upsert=True)
+
+@app.on_event("startup")
+async def init_slot_counters():
+    # Backfill counters once for upcoming dates booked before slot_counters existed
+    if await db.slot_counters.find_one({}, {"_id": 1}):
+        return
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    booked = await db.bookings.aggregate([
+        {"$match": {"for_date": {"$gte": today}, "status": {"$ne": "Cancelled"}}},
+        {"$group": {"_id": {"slot_id": "$slot_id", "for_date": "$for_date"}, "n": {"$sum": 1}}},
+    ]).to_list(None)
+    if not booked:
+        return
+    try:
+        await db.slot_counters.bulk_write([UpdateOne(b["_id"], {"$setOnInsert": {"n": b["n"]}}, upsert=True) for b in booked], ordered=False)
+    except BulkWriteError:
+        # Another worker backfilled the same counters concurrently
+        pass
+
+@app.on_event("startup")
+async def load_seed_state():
+    app.state.seeded = bool(await db.user_accounts.find_one({"username": "admin"}, {"_id": 1}))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()